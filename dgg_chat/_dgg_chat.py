@@ -1,9 +1,10 @@
 import time
 import logging
-import queue
+from random import random
 from os import getenv
-from queue import Queue
-from threading import Thread
+from re import compile, escape, IGNORECASE
+from collections import OrderedDict, deque
+from threading import Condition, Thread
 from websocket import WebSocketApp
 from websocket._exceptions import WebSocketException
 
@@ -16,27 +17,54 @@ from .exceptions import (
 )
 from .messages import Message, EventTypes, ChatUser
 from .api import DGGAPI, User
-from ._utils import format_payload
+from ._utils import format_payload, format_whisper
 from ._handler import DGGChatEventHandler
 
 
+_AUTH_TOKEN_PATTERN = compile(r'[A-Za-z0-9]{64}')
+# events always parsed, since they're used internally
+_INTERNAL_EVENTS = frozenset((EventTypes.ERROR_MESSAGE, EventTypes.WHISPER_SENT, EventTypes.WHISPER))
+
+
 class DGGChat:
     """
     A dgg chat API.    
     """
 
     DGG_WS = 'wss://destiny.gg/ws'
+    # reconnect delay doubles on each attempt, up to the max, with jitter
     RECONNECT_DELAY = 3    # in seconds
+    MAX_RECONNECT_DELAY = 60  # in seconds
+    # reconnect delay is reset if the connection lasted at least this long
+    RECONNECT_RESET = 60  # in seconds
     WAIT_WS_BOOTSTRAP = 1  # in seconds
-    # considering server throttle is 300ms and some network overhead
-    WS_THROTTLE_DELAY = .200  # in seconds
-    # after this much time after last sent message, throttle factor is reset
-    WS_THROTTLE_RESET = 600  # in seconds
-    # throttling should be a very exceptional case, so instead of starting at 1,
-    # a bit of padding ensures it doesn't happen multiple times in a row
-    BASE_WS_THROTTLE_FACTOR = 1.1
+    # messages are sent using a token bucket, so the client throttles itself
+    # before the server has to. server throttle is 300ms between messages,
+    # with no bursts allowed, so the bucket only ever holds a single token
+    THROTTLE_CAPACITY = 1  # in tokens
+    THROTTLE_REFILL_RATE = 1/.300  # in tokens per second
+    # when throttled anyway, the refill rate is halved down to this fraction.
+    # max server throttle seems to be 16 times the base delay (16*.3=5s)
+    # verified empirically since this doesn't seem to match the source code (https://github.com/destinygg/chat/blob/master/connection.go#L407)
+    MIN_THROTTLE_REFILL_FACTOR = 1/16
+    # after this much time without being throttled, refill rate is reset
+    THROTTLE_RESET = 600  # in seconds
+
+    # failed sends are retried with a doubling delay, up to this many times
+    MAX_SEND_RETRIES = 5
+    SEND_RETRY_DELAY = .5  # in seconds
+    # how often the send loop wakes up to check if it should still be running
+    SEND_LOOP_TIMEOUT = 1  # in seconds
 
     MAX_MESSAGE_LENGTH = 512
+    # least recently seen users are forgotten past this amount
+    MAX_USERS_AVAILABLE_TO_WHISPER = 4096
+    # queued messages of the same type and to the same user
+    # are merged into one if queued within this window of each other.
+    # set to 0 to disable merging
+    MERGE_WINDOW = .050  # in seconds
+    # padding from the max length, just to be safe
+    MAX_MERGED_LENGTH = 480
 
     def __init__(
         self, auth_token=None, session_id=None,
@@ -99,21 +127,42 @@ class DGGChat:
         self._auth_token = auth_token
         self._session_id = session_id
 
-        self._running = False
-        self._users_available_to_whisper = set()
-
-        self._last_message_time = 0
-        self._next_message_time = time.time()
-        self._ws_throttle_factor = self.BASE_WS_THROTTLE_FACTOR
-        self._anti_throttle_bot = anti_throttle_bot
+        self._whispers_enabled = str(getenv('DGG_ENABLE_WHISPERS')).lower() not in ('', 'none', 'false')
 
-        self._queued_messages = Queue()
-        self._unhandled_messages = Queue()
+        self._running = False
+        # only written to by the dispatch thread, used as an LRU set.
+        # nicks are casefolded, since they're case insensitive
+        self._users_available_to_whisper = OrderedDict()
+
+        self._tokens = self.THROTTLE_CAPACITY
+        self._last_refill = time.monotonic()
+        self._refill_rate = self.THROTTLE_REFILL_RATE
+        self._last_throttled = 0
+        self._anti_throttle_payload = format_whisper(anti_throttle_bot, '0') if anti_throttle_bot else None
+
+        # `(queued_at, type, kwargs)` tuples, formatted into payloads when sent
+        self._queued_messages = deque()
+        # last payload sent, until it's acknowledged by the server
+        self._pending_payload = None
+        # notified when a message is queued or acknowledged
+        self._send_condition = Condition()
+        self._send_thread = None
+
+        # raw messages received, parsed and handled by the dispatch loop
+        # so slow handlers don't hold up the websocket thread.
+        # other events are queued as `(function, args)` tuples, so handlers are never called concurrently
+        self._received_messages = deque()
+        self._dispatch_condition = Condition()
+        self._dispatch_thread = None
 
         self._handler = DGGChatEventHandler()
         self._api = DGGAPI(auth_token, session_id)
 
-        self._profile = self._reload_profile() if auth_token else None
+        self._profile = None
+        # matches the profile's nick in chat messages
+        self._mention_pattern = None
+        if auth_token:
+            self._reload_profile()
 
         self._setup_web_socket()
 
@@ -126,7 +175,12 @@ class DGGChat:
 
     @property
     def throttle_factor(self):
-        return self._ws_throttle_factor
+        """How many times slower than the base rate messages are currently sent at."""
+        return self.THROTTLE_REFILL_RATE/self._refill_rate
+
+    @property
+    def throttle_tokens(self):
+        return self._tokens
 
     @property
     def profile(self):
@@ -138,81 +192,175 @@ class DGGChat:
 
     @staticmethod
     def auth_token_is_valid(token):
-        return len(token) == 64 and token.isalnum()
+        return token is not None and _AUTH_TOKEN_PATTERN.fullmatch(token) is not None
 
     @staticmethod
     def message_is_valid(msg):
         return 0 < len(msg) <= DGGChat.MAX_MESSAGE_LENGTH
 
     def _handle_errors(self):
-        if self._handler.errors:
-            self._handler.handle_event(EventTypes.Special.HANDLER_ERROR, self._handler.errors)
-            self._handler.errors.clear()
+        # the handler gets a list of its own, which isn't cleared afterwards
+        errors = self._handler.pop_errors()
+        if errors:
+            self._handler.handle_event(EventTypes.Special.HANDLER_ERROR, errors)
 
     def _setup_web_socket(self):
-        def on_message(ws, message):
+        # bound once as locals, since they're used for every message
+        chat_message = EventTypes.CHAT_MESSAGE
+        whisper_sent = EventTypes.WHISPER_SENT
+        before_every_message = EventTypes.Special.BEFORE_EVERY_MESSAGE
+        after_every_message = EventTypes.Special.AFTER_EVERY_MESSAGE
+        handler = self._handler
+        handle_event = handler.handle_event
+        handle_chat_message = self._handle_chat_message
+
+        # internal handling for some events, done before their handlers are called
+        internal_handlers = {
+            EventTypes.ERROR_MESSAGE: self._handle_message,
+            EventTypes.WHISPER_SENT: self._handle_message,
+            EventTypes.WHISPER: self._handle_whisper,
+        }
+
+        def dispatch_message(message):
             """The top-level message handling function."""
 
-            parsed = Message.parse(message)
+            event = Message.peek_event(message)
+            if not self._needs_parsing(event):
+                logging.debug('ignoring message: `%s`', message)
+                return
 
-            logging.debug(f"received message: `{message}`")
-            logging.info(f"parsed message: `{parsed}`")
+            parsed = Message.parse(message, event)
+            event = parsed.event
 
-            self._handler.handle_event(EventTypes.Special.BEFORE_EVERY_MESSAGE, parsed)
+            # avoid formatting messages that won't be logged
+            if logging.root.isEnabledFor(logging.INFO):
+                logging.debug('received message: `%s`', message)
+                logging.info('parsed message: `%s`', parsed)
 
-            if not self._unhandled_messages.empty() and parsed.event in (EventTypes.ERROR_MESSAGE, EventTypes.WHISPER_SENT):
-                self._handle_message(parsed)
+            handle_event(before_every_message, parsed)
 
-            if parsed.event == EventTypes.WHISPER:
-                enabled = str(getenv('DGG_ENABLE_WHISPERS')).lower()
-                if enabled and enabled != 'false':
-                    self._users_available_to_whisper.add(parsed.user.nick)
-                    logging.info(
-                        f"{parsed.user.nick} added to users available to whisper"
-                    )
+            # chat messages are by far the most common, so they skip the generic dispatch.
+            # parsed events are interned, so they can be compared by identity
+            if event is chat_message:
+                handle_chat_message(parsed)
+            else:
+                internal_handler = internal_handlers.get(event)
+                if internal_handler:
+                    internal_handler(parsed)
 
-            if self._profile and parsed.event == EventTypes.CHAT_MESSAGE and self._profile.nick in parsed.content:
-                self._handler.handle_event(EventTypes.Special.MENTION, parsed)
+                if event is whisper_sent:
+                    # `on_whisper_sent` handler takes no arguments
+                    return handle_event(event)
 
-            if parsed.event == EventTypes.WHISPER and self.mark_as_read:
-                self.mark_all_as_read(parsed.user.nick)
+            handle_event(event, parsed)
+            handle_event(after_every_message, parsed)
+            if handler.errors:
+                self._handle_errors()
 
-            if parsed.event == EventTypes.WHISPER_SENT:
-                # `on_whisper_sent` handler takes no arguments
-                return self._handler.handle_event(parsed.event)
-            self._handler.handle_event(parsed.event, parsed)
-            self._handler.handle_event(EventTypes.Special.AFTER_EVERY_MESSAGE, parsed)
-            self._handle_errors()
+        def on_message(ws, message):
+            """Queues a message received, to be handled by the dispatch loop."""
+
+            with self._dispatch_condition:
+                self._received_messages.append(message)
+                self._dispatch_condition.notify()
+
+        self._dispatch_message = dispatch_message
 
         def on_ws_error(ws, error):
             """Handler for websocket related errors."""
 
-            self._handler.handle_event(EventTypes.Special.WS_ERROR, error)
+            self._queue_event(EventTypes.Special.WS_ERROR, error)
 
             msg = f"websocket error: `{error}`"
 
             logging.error(msg)
             raise WebSocketException(msg)
 
+        def on_open(ws):
+            """Handler for when the websocket connection is (re)established."""
+
+            logging.info('connection opened')
+            # started from the dispatch loop, so acks from the previous connection
+            # still queued are handled before anything is sent on this one
+            self._queue_call(self._start_send_loop)
+
         def on_close(ws):
             """Handler for when the websocket connection is closed."""
 
-            self._handler.handle_event(EventTypes.Special.WS_CLOSE)
-            self._running = False
+            self._queue_event(EventTypes.Special.WS_CLOSE)
+            self._stop_send_loop()
 
             logging.info('connection closed')
 
         self._ws = WebSocketApp(
             self.DGG_WS,
+            on_open=on_open,
             on_message=on_message,
             on_error=on_ws_error,
             on_close=on_close,
             cookie=f"authtoken={self._auth_token}" if self._auth_token else None
         )
 
+    def _start_dispatch_loop(self):
+        # kept running across reconnects, so messages already received are still handled
+        if self._dispatch_thread is None:
+            self._dispatch_thread = Thread(target=self._dispatch_loop, daemon=True)
+            self._dispatch_thread.start()
+
+    def _queue_call(self, f, *args):
+        """Queues a call to `f`, made by the dispatch loop in order with the messages received."""
+
+        with self._dispatch_condition:
+            self._received_messages.append((f, args))
+            self._dispatch_condition.notify()
+
+    def _queue_event(self, event, *args):
+        """Queues an event not received as a message, to be handled by the dispatch loop."""
+
+        self._queue_call(self._handle_event, event, *args)
+
+    def _handle_event(self, event, *args):
+        self._handler.handle_event(event, *args)
+        self._handle_errors()
+
+    def _dispatch_loop(self):
+        # bound once as locals, since they're used for every message received
+        received_messages = self._received_messages
+        dispatch_message = self._dispatch_message
+
+        while True:
+            with self._dispatch_condition:
+                while not received_messages:
+                    self._dispatch_condition.wait()
+                message = received_messages.popleft()
+
+            try:
+                if type(message) is tuple:
+                    f, args = message
+                    f(*args)
+                else:
+                    dispatch_message(message)
+            except Exception as e:
+                logging.error('on dispatch loop: %s', e)
+
+    def _needs_parsing(self, event):
+        """Whether a message of type `event` has to be parsed, either to be handled or for internal use."""
+
+        if event in _INTERNAL_EVENTS:
+            return True
+
+        has_handler = self._handler.has_handler
+        return (
+            has_handler(event)
+            or has_handler(EventTypes.Special.BEFORE_EVERY_MESSAGE)
+            or has_handler(EventTypes.Special.AFTER_EVERY_MESSAGE)
+            or (event == EventTypes.CHAT_MESSAGE and has_handler(EventTypes.Special.MENTION))
+        )
+
     def _reload_profile(self):
         self._profile = self._api.user_info()
-        logging.info(f"profile updated: {self._profile}")
+        self._mention_pattern = compile(rf"\b{escape(self._profile.nick)}\b", IGNORECASE)
+        logging.info('profile updated: %s', self._profile)
 
     def _handle_history(self):
         """Handles the 150 most recent chat messages up until chat is connected."""
@@ -220,8 +368,21 @@ class DGGChat:
         logging.info('handling history')
 
         history = self._api.chat_history()
-        for message in history:
-            self._handler.handle_event(message.event, Message.parse(message))
+        handle_event = self._handler.handle_event
+        has_handler = self._handler.has_handler
+
+        # when handled as a whole, every message is needed
+        if has_handler(EventTypes.Special.HISTORY):
+            parsed = [Message.parse(message) for message in history]
+            handle_event(EventTypes.Special.HISTORY, parsed)
+        else:
+            parsed = [
+                Message.parse(message) for message in history
+                if has_handler(Message.peek_event(message))
+            ]
+
+        for message in parsed:
+            handle_event(message.event, message)
 
     def _handle_unread_whispers(self):
         """Handles unread whispers. Marks them as read."""
@@ -238,77 +399,244 @@ class DGGChat:
                     whisper.event, whisper.as_websocket_message
                 )
 
+    def _handle_whisper(self, whisper):
+        if self._whispers_enabled:
+            users = self._users_available_to_whisper
+            nick = whisper.user.nick.casefold()
+            if nick in users:
+                users.move_to_end(nick)
+            else:
+                users[nick] = None
+                logging.info('%s added to users available to whisper', whisper.user.nick)
+                if len(users) > self.MAX_USERS_AVAILABLE_TO_WHISPER:
+                    users.popitem(last=False)
+
+        if self.mark_as_read:
+            # only the whisper received, so the rest of the inbox isn't retrieved
+            self._api.messages_open(whisper.message_id)
+
+    def _handle_chat_message(self, message):
+        # own messages aren't mentions, no need to search them
+        if (
+            self._mention_pattern
+            and message.user.nick != self._profile.nick
+            and self._mention_pattern.search(message.content)
+        ):
+            self._handler.handle_event(EventTypes.Special.MENTION, message)
+
     def _handle_message(self, message):
-        try:
-            payload = self._unhandled_messages.get_nowait()
-        except queue.Empty as e:
-            logging.fatal('unhandled messages queue was empty')
-            raise e
-
-        now = time.time()
-        if now >= self._last_message_time + self.WS_THROTTLE_RESET:
-            logging.info('resetting throttle factor')
-            self._ws_throttle_factor = self.BASE_WS_THROTTLE_FACTOR
-
-        if message.event == EventTypes.ERROR_MESSAGE:
-            # max throttle factor seems to be 16 (16*.3=5s)
-            # verified empirically since this doesn't seem to match the source code (https://github.com/destinygg/chat/blob/master/connection.go#L407)
-            if message.payload == 'throttled':
-                logging.warning('connection throttled')
-                self._ws_throttle_factor = min(16, 2*self._ws_throttle_factor)
-
-            if message.payload == 'duplicate':
-                logging.warning('duplicate message')
-                self._ws_throttle_factor = min(
-                    16, 1 + self._ws_throttle_factor
-                )
-        else:
-            self._last_message_time = now
+        """Handles the server's response to the last message sent."""
+
+        with self._send_condition:
+            if self._pending_payload is None:
+                return
+
+            if message.event == EventTypes.ERROR_MESSAGE:
+                # the bucket should prevent this, but in case it happens
+                # the next message has to wait for a full refill at a slower rate
+                if message.payload == 'throttled':
+                    logging.warning('connection throttled')
+                    self._tokens = 0
+                    self._last_refill = self._last_throttled = time.monotonic()
+                    self._refill_rate = max(
+                        self.THROTTLE_REFILL_RATE*self.MIN_THROTTLE_REFILL_FACTOR,
+                        self._refill_rate/2
+                    )
 
-        self._next_message_time = now + self._ws_throttle_factor*self.WS_THROTTLE_DELAY
+                if message.payload == 'duplicate':
+                    logging.warning('duplicate message')
+                    self._tokens -= 1
+
+            logging.debug('payload acknowledged: `%s`', self._pending_payload)
+            self._pending_payload = None
+            self._send_condition.notify()
+
+    def _refill_tokens(self):
+        now = time.monotonic()
+        if self._refill_rate != self.THROTTLE_REFILL_RATE and now >= self._last_throttled + self.THROTTLE_RESET:
+            logging.info('resetting throttle refill rate')
+            self._refill_rate = self.THROTTLE_REFILL_RATE
+
+        self._tokens = min(
+            self.THROTTLE_CAPACITY,
+            self._tokens + (now - self._last_refill)*self._refill_rate
+        )
+        self._last_refill = now
 
     def _start_send_loop(self):
-        Thread(target=self._send_loop, daemon=True).start()
+        # the loop from a previous connection exits as soon as it notices it was stopped
+        if self._send_thread is not None:
+            self._send_thread.join()
+
+        with self._send_condition:
+            self._running = True
+            # a payload sent on a previous connection won't be acknowledged on this one
+            self._pending_payload = None
+
+        self._send_thread = Thread(target=self._send_loop, daemon=True)
+        self._send_thread.start()
 
     def _send_loop(self):
         time.sleep(self.WAIT_WS_BOOTSTRAP)
-        self._running = True
-        while True:
-            while not self._next_message_time or time.time() < self._next_message_time:
+
+        # bound once as locals, since they're used for every message sent
+        pop_queued_message = self._pop_queued_message
+        merge_queued_messages = self._merge_queued_messages
+        send = self._ws.send
+
+        while self._running:
+            message = pop_queued_message()
+            if message is None:
                 continue
 
+            if self.MERGE_WINDOW:
+                message = merge_queued_messages(message)
+
             if not self._running:
+                self._push_queued_message(message, front=True)
                 break
 
-            self._next_message_time = 0
+            _, type, kwargs = message
+            if type == EventTypes.WHISPER:
+                payload = format_whisper(kwargs['nick'], kwargs['data'])
+            else:
+                payload = format_payload(type, **kwargs)
+            logging.debug('sending payload: `%s`', payload)
+
+            # set before sending, since the ack might arrive before `send()` returns
+            self._pending_payload = payload
+            error = self._send_with_retries(send, payload)
+            if error:
+                self._pending_payload = None
+                if not self._running:
+                    # will be the first message sent when resumed
+                    self._push_queued_message(message, front=True)
+                    break
+
+                logging.error('dropping payload after %d retries: `%s`', self.MAX_SEND_RETRIES, payload)
+                self._queue_event(EventTypes.Special.WS_ERROR, error)
+                continue
+
+            if self._anti_throttle_payload:
+                self._send_anti_throttle_payload(send)
 
-            payload = self._queued_messages.get()
-            logging.debug(f"sending payload: `{payload}`")
+    def _send_anti_throttle_payload(self, send):
+        """
+        Sends the anti-throttle payload once the message it follows is acknowledged.
+        It's acknowledged and throttled like any other message, so acks stay in step with what was sent.
+        """
+
+        payload = self._anti_throttle_payload
+        while self._running:
+            if self._pop_queued_message(payload) is None:
+                continue
+
+            logging.debug('anti-throttle payload: `%s`', payload)
+            self._pending_payload = payload
+            if self._send_with_retries(send, payload):
+                self._pending_payload = None
+            return
+
+    def _send_with_retries(self, send, payload):
+        """
+        Sends `payload`, retrying with a doubling delay on failure,
+        so later messages don't overtake it. Returns the last error if all attempts failed.
+        """
 
+        delay = self.SEND_RETRY_DELAY
+        for attempt in range(self.MAX_SEND_RETRIES + 1):
             try:
-                self._ws.send(payload)
+                send(payload)
+                return None
             except Exception as e:
-                logging.error(f"on send loop: {e}")
-                self._queued_messages.put(payload)
-                continue
-            
-            self._unhandled_messages.put(payload)
+                logging.error('on send loop: %s', e)
+                error = e
 
-            if self._anti_throttle_bot:
-                anti_throttle_payload = format_payload(
-                    EventTypes.WHISPER, nick=self._anti_throttle_bot, data='0'
-                )
-                logging.debug(
-                    f"anti-throttle payload: `{anti_throttle_payload}`"
-                )
+            if attempt == self.MAX_SEND_RETRIES or not self._running:
+                break
+            time.sleep(delay)
+            delay *= 2
+
+        return error
+
+    def _stop_send_loop(self):
+        """Stops the send loop, waking it up if it's waiting."""
+
+        with self._send_condition:
+            self._running = False
+            self._send_condition.notify()
+
+    def _push_queued_message(self, message, front=False):
+        with self._send_condition:
+            if front:
+                self._queued_messages.appendleft(message)
+            else:
+                self._queued_messages.append(message)
+            self._send_condition.notify()
+
+    def _pop_queued_message(self, message=None):
+        """
+        Waits for a queued message, for the last message sent to be acknowledged,
+        and for a throttle token, which is consumed.
+        All of those are waited on at once, so whichever happens last wakes the send loop.
+        When `message` is set, it's returned instead of a queued one.
+        Returns `None` if that doesn't happen in time, or if the send loop was stopped.
+        """
+
+        deadline = time.monotonic() + self.SEND_LOOP_TIMEOUT
+        with self._send_condition:
+            while self._running:
+                timeout = deadline - time.monotonic()
+                if (message is not None or self._queued_messages) and self._pending_payload is None:
+                    self._refill_tokens()
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return message if message is not None else self._queued_messages.popleft()
+                    timeout = min(timeout, (1 - self._tokens)/self._refill_rate)
+
+                if timeout <= 0:
+                    return None
+                self._send_condition.wait(timeout)
+        return None
+
+    def _merge_queued_messages(self, message):
+        """
+        Merges the messages queued right after `message` with the same type and target,
+        joining their contents with line breaks. Returns the merged message.
+        """
+
+        queued_at, type, kwargs = message
+        if 'data' not in kwargs:
+            return message
+
+        contents = [kwargs['data']]
+        length = len(kwargs['data'])
+        while self._queued_messages:
+            next_queued_at, next_type, next_kwargs = self._queued_messages[0]
+            next_content = next_kwargs.get('data')
+            if (
+                next_type != type
+                or next_content is None
+                or next_kwargs.get('nick') != kwargs.get('nick')
+                or next_queued_at - queued_at > self.MERGE_WINDOW
+                or length + 1 + len(next_content) > self.MAX_MERGED_LENGTH
+            ):
+                break
+
+            self._queued_messages.popleft()
+            contents.append(next_content)
+            length += 1 + len(next_content)
+            queued_at = next_queued_at
 
-                self._ws.send(anti_throttle_payload)
-                self._unhandled_messages.put(anti_throttle_payload)
+        if len(contents) == 1:
+            return message
+
+        logging.debug('merged %d queued messages', len(contents))
+        return queued_at, type, {**kwargs, 'data': '\n'.join(contents)}
 
     def _queue_message(self, type, **kwargs):
-        payload = format_payload(type, **kwargs)
-        logging.debug(f"enqueueing payload: `{payload}`")
-        self._queued_messages.put(payload)
+        logging.debug('enqueueing message: `%s %s`', type, kwargs)
+        self._push_queued_message((time.monotonic(), type, kwargs))
 
     def update_profile(self):
         """
@@ -322,8 +650,17 @@ class DGGChat:
         self._reload_profile()
 
     def mark_all_as_read(self, from_user=None):
-        # TODO: implement more efficiently (use `/messages/inbox|read` endpoints)
-        self.get_unread_whispers(from_user=from_user)
+        """
+        Marks all whispers as read. When `from_user` is set, only whispers from that user
+        are marked, which requires retrieving them.
+        """
+
+        if not from_user:
+            if not self._session_id:
+                raise AnonymousSessionError('unable to mark messages as read')
+            self._api.messages_read()
+        else:
+            self.get_unread_whispers(from_user=from_user)
 
     def get_unread_whispers(self, from_user=None, received_only=True):
         """
@@ -352,14 +689,17 @@ class DGGChat:
 
         return messages
 
-    def connect(self):
-        """Connect to chat and run in a new thread (non-blocking)."""
+    def connect(self, **kwargs):
+        """
+        Connect to chat and run in a new thread (non-blocking).
+        `kwargs` are passed to `run_forever()`.
+        """
 
         if self._running:
             raise ConnectionError('chat is already connected')
 
         logging.info('setting up connection')
-        t = Thread(target=self.run_forever, daemon=True)
+        t = Thread(target=self.run_forever, kwargs=kwargs, daemon=True)
         t.start()
 
         time.sleep(self.WAIT_WS_BOOTSTRAP)
@@ -374,10 +714,15 @@ class DGGChat:
         self._ws.close()
 
         logging.info('disconnected')
-        self._running = False
+        self._stop_send_loop()
 
-    def run_forever(self):
-        """Connect to chat and block the thread."""
+    def run_forever(self, **kwargs):
+        """
+        Connect to chat and block the thread.
+        `kwargs` are passed to `WebSocketApp.run_forever()`.
+        UTF-8 validation is skipped by default, since messages are validated when parsed,
+        and keepalive pings are sent every 20 seconds so dropped connections are noticed.
+        """
 
         if self._running:
             raise ConnectionError(
@@ -393,15 +738,32 @@ class DGGChat:
         self._handle_errors()
 
         logging.info('running websocket on loop')
-        self._start_send_loop()
+        # the send loop is (re)started whenever the connection is opened
+        self._start_dispatch_loop()
 
-        while self._ws.run_forever():
-            logging.warning(
-                f"connection dropped. trying to reconnect in {self.RECONNECT_DELAY} seconds..."
-            )
-            time.sleep(self.RECONNECT_DELAY)
+        kwargs = {'skip_utf8_validation': True, 'ping_interval': 20, 'ping_timeout': 10, **kwargs}
+        attempts = 0
+        while True:
+            connected_at = time.monotonic()
+            if not self._ws.run_forever(**kwargs):
+                break
+
+            if time.monotonic() - connected_at >= self.RECONNECT_RESET:
+                attempts = 0
+            delay = min(self.MAX_RECONNECT_DELAY, self.RECONNECT_DELAY*2**attempts*(.5 + random()))
+            attempts += 1
+
+            logging.warning('connection dropped. trying to reconnect in %.1f seconds...', delay)
+            time.sleep(delay)
 
     def send_whisper(self, user, message):
+        """
+        Queues a whisper to `user`. Whispers to the same user queued within `MERGE_WINDOW`
+        of each other are sent as a single whisper, separated by line breaks,
+        in which case `on_whisper_sent` is only called once for all of them.
+        Set `MERGE_WINDOW` to 0 to disable merging.
+        """
+
         if not self.message_is_valid(message):
             raise InvalidMessageError(message)
 
@@ -411,13 +773,37 @@ class DGGChat:
         if self._profile and self._profile.nick == user:
             raise ValueError("you can't whisper yourself, you silly goose")
 
-        enabled = str(getenv('DGG_ENABLE_WHISPERS')).lower()
-        if not enabled or enabled in ('none', 'false') or user not in self._users_available_to_whisper:
+        if not self._whispers_enabled or user.casefold() not in self._users_available_to_whisper:
             raise DumbFucksBeware('cannot send whispers')
 
-        logging.info(f"queue send whisper to {user}: `{message}`")
+        logging.info('queue send whisper to %s: `%s`', user, message)
         self._queue_message(EventTypes.WHISPER, nick=user, data=message)
 
+    def send_whispers(self, user, messages):
+        """
+        Sends multiple whispers to `user`, packing as many as possible
+        into each message sent, separated by line breaks. Order is preserved.
+        """
+
+        messages = list(messages)
+        for message in messages:
+            if not self.message_is_valid(message):
+                raise InvalidMessageError(message)
+
+        chunks = []
+        chunk, length = [], 0
+        for message in messages:
+            if chunk and length + 1 + len(message) > self.MAX_MERGED_LENGTH:
+                chunks.append(chunk)
+                chunk, length = [], 0
+            length += len(message) + (1 if chunk else 0)
+            chunk.append(message)
+        if chunk:
+            chunks.append(chunk)
+
+        for chunk in chunks:
+            self.send_whisper(user, '\n'.join(chunk))
+
     def _on(self, event, f):
         return self._handler.on(event, f)
 
@@ -511,6 +897,16 @@ class DGGChat:
 
         return self._on(EventTypes.Special.HANDLER_ERROR, f)
 
+    def on_history(self, f):
+        """
+        Called with the list of messages from chat history, when `handle_history` is enabled.
+        Useful for handling them all at once (e.g. storing them in a single transaction).
+        It's not called by the handler, but by the `DGGChat` instance,
+        so it doesn't need to be mapped. The handlers for each message are still called.
+        """
+
+        return self._on(EventTypes.Special.HISTORY, f)
+
     def before_every_message(self, f):
         return self._on(EventTypes.Special.BEFORE_EVERY_MESSAGE, f)
 
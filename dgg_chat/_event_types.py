@@ -13,6 +13,8 @@ class EventTypes:
     SUB_ONLY = 'SUBONLY'
     ERROR_MESSAGE = 'ERR'
 
+    MODERATION_EVENTS = frozenset((MUTE, UNMUTE, BAN, UNBAN))
+
     class Special:
         BEFORE_EVERY_MESSAGE = 'BEFORE_EVERY_MESSAGE'
         AFTER_EVERY_MESSAGE = 'AFTER_EVERY_MESSAGE'
@@ -20,7 +22,8 @@ class EventTypes:
         WS_ERROR = 'WS_ERROR'
         WS_CLOSE = 'WS_CLOSE'
         HANDLER_ERROR = 'HANDLER_ERROR'
+        HISTORY = 'HISTORY'
 
     @staticmethod
     def is_moderation_event(msg_type):
-        return msg_type in (EventTypes.MUTE, EventTypes.UNMUTE, EventTypes.BAN, EventTypes.UNBAN)
+        return msg_type in EventTypes.MODERATION_EVENTS
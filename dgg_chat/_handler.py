@@ -10,28 +10,30 @@ class DGGChatEventHandler:
     def errors(self):
         return self._errors
 
+    def pop_errors(self):
+        """Returns the errors raised so far, starting a new list."""
+        errors, self._errors = self._errors, []
+        return errors
+
     def on(self, event, f):
-        self._handlers.setdefault(event, set()).add(f)
+        # handlers are kept as tuples, in registration order. they're replaced instead of
+        # mutated, so registering doesn't affect a dispatch already iterating them
+        handlers = self._handlers.get(event, ())
+        if f not in handlers:
+            self._handlers[event] = handlers + (f,)
         return f
 
-    def handle_event(self, event, *args):
-        if event not in self._handlers:
-            logging.debug(f"event type `{event}` not handled")
-            return
+    def has_handler(self, event):
+        return bool(self._handlers.get(event))
 
+    def handle_event(self, event, *args):
         handlers = self._handlers.get(event)
-
         if not handlers:
-            logging.debug(
-                f"no handler registered for event type `{event}`"
-            )
+            logging.debug('no handler registered for event type `%s`', event)
             return
 
         for handler in handlers:
             try:
-                if args:
-                    handler(*args)
-                else:
-                    handler()
+                handler(*args)
             except Exception as e:
                 self._errors.append(e)
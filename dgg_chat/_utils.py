@@ -1,91 +1,77 @@
 from re import compile
-from json import dumps
-from types import MethodType
+from functools import lru_cache
 from datetime import datetime
 
+import orjson
+
+try:
+    # optional, faster parsing for api datetimes
+    from ciso8601 import parse_datetime_as_naive
+except ImportError:
+    parse_datetime_as_naive = None
+
+from ._event_types import EventTypes
+
 
 _CAMEL_SNAKE_PATTERN = compile(r'(?<!^)(?=[A-Z])')
 
+# prefixes for the types of payloads most commonly sent
+_PAYLOAD_PREFIXES = {
+    EventTypes.CHAT_MESSAGE: f"{EventTypes.CHAT_MESSAGE} ".encode(),
+    EventTypes.WHISPER: f"{EventTypes.WHISPER} ".encode(),
+}
+
 
 def format_payload(type, **kwargs):
-    """Formats a message to the DGG websocket format."""
-    return f"{type} {dumps(kwargs)}"
+    """Formats a message to the DGG websocket format, as utf8 encoded bytes."""
+    return _format_payload(type, tuple(kwargs.items()))
 
 
-def dict_swap_keys(d, key_map):
-    swapped = d.copy()
-    for key in d:
-        if key in key_map:
-            new_key = key_map[key]
-            swapped[new_key] = swapped.pop(key)
-    return swapped
+# bots often send the same messages over and over (command replies and such)
+@lru_cache(maxsize=256)
+def _format_payload(type, items):
+    prefix = _PAYLOAD_PREFIXES.get(type) or f"{type} ".encode()
+    return prefix + orjson.dumps(dict(items))
 
 
-def camel_to_snake_case(s):
-    return _CAMEL_SNAKE_PATTERN.sub('_', s).lower()
+@lru_cache(maxsize=256)
+def format_whisper(nick, data):
+    """Same as `format_payload(EventTypes.WHISPER, nick=nick, data=data)`, without the kwargs overhead."""
+    return _PAYLOAD_PREFIXES[EventTypes.WHISPER] + orjson.dumps({'nick': nick, 'data': data})
 
 
-def dict_keys_camel_to_snake_case(d):
-    snaked = d.copy()
-    for key in d:
-        new_key = camel_to_snake_case(key)
-        snaked[new_key] = snaked.pop(key)
-    return snaked
+def dict_swap_keys(d, key_map):
+    return {key_map.get(key, key): value for key, value in d.items()}
 
 
-def format_datetime(dt, fmt='%Y-%m-%d %H:%M:%S', with_ms=False):
-    if with_ms:
-        fmt = f"{fmt}.%f"
-    return dt.strftime(fmt)
+# api responses only ever use a handful of keys
+@lru_cache(maxsize=256)
+def camel_to_snake_case(s):
+    return _CAMEL_SNAKE_PATTERN.sub('_', s).lower()
 
 
-def validate_date_time(year=1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0):
-    datetime(year, month, day, hour, minute, second, microsecond)
+API_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S+0000'
 
 
-def isplit(source, sep=None, regex=False):
+def parse_api_datetime(s):
+    """
+    Parses a datetime in the api format (`API_DATETIME_FORMAT`).
+    Uses `ciso8601` if installed. Otherwise, since the format is fixed,
+    it's sliced instead of going through `strptime()`.
     """
-    https://stackoverflow.com/a/9773142
-    generator version of str.split()
 
-    :param source:
-        source string (unicode or bytes)
+    try:
+        if parse_datetime_as_naive:
+            return parse_datetime_as_naive(s)
+        return datetime(
+            int(s[0:4]), int(s[5:7]), int(s[8:10]),
+            int(s[11:13]), int(s[14:16]), int(s[17:19]),
+        )
+    except ValueError:
+        # in case the format changes, so at least the error is meaningful
+        return datetime.strptime(s, API_DATETIME_FORMAT)
 
-    :param sep:
-        separator to split on.
 
-    :param regex:
-        if True, will treat sep as regular expression.
+def validate_date_time(year=1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0):
+    datetime(year, month, day, hour, minute, second, microsecond)
 
-    :returns:
-        generator yielding elements of string.
-    """
-    if sep is None:
-        # mimic default python behavior
-        source = source.strip()
-        sep = "\\s+"
-        if isinstance(source, bytes):
-            sep = sep.encode("ascii")
-        regex = True
-    if regex:
-        # version using re.finditer()
-        if not hasattr(sep, "finditer"):
-            sep = re.compile(sep)
-        start = 0
-        for m in sep.finditer(source):
-            idx = m.start()
-            assert idx >= start
-            yield source[start:idx]
-            start = m.end()
-        yield source[start:]
-    else:
-        # version using str.find(), less overhead than re.finditer()
-        sepsize = len(sep)
-        start = 0
-        while True:
-            idx = source.find(sep, start)
-            if idx == -1:
-                yield source[start:]
-                return
-            yield source[start:idx]
-            start = idx + sepsize
@@ -1,7 +1,8 @@
 import logging
-from json import loads
 from datetime import datetime
-from requests import get
+from requests import get, post
+
+import orjson
 
 from ._user import User
 from ._stream_info import StreamInfo
@@ -21,18 +22,27 @@ class DGGAPI:
     def auth_token(self):
         return self._auth_token
 
-    def _get(self, endpoint, as_json=True):
-        logging.info(f"calling api on `{endpoint}`")
+    def _request(self, method, endpoint, as_json=True):
+        logging.info('calling api on `%s`', endpoint)
 
         endpoint = f"{self.DGG_API}{endpoint}"
         cookies = dict(authtoken=self._auth_token, sid=self._session_id)
 
-        r = get(endpoint, cookies=cookies)
+        r = method(endpoint, cookies=cookies)
         if r.status_code != 200:
+            logging.warning('failed to call `%s`: %s', endpoint, r.status_code)
             raise APIError(endpoint, r)
 
-        logging.info(f"received from api: `{r.content.decode('utf8')}`")
-        return loads(r.content) if as_json else r.content
+        # avoid decoding responses that won't be logged
+        if logging.root.isEnabledFor(logging.INFO):
+            logging.info('received from api: `%s`', r.content.decode('utf8'))
+        return orjson.loads(r.content) if as_json else r.content
+
+    def _get(self, endpoint, as_json=True):
+        return self._request(get, endpoint, as_json)
+
+    def _post(self, endpoint, as_json=True):
+        return self._request(post, endpoint, as_json)
 
     def user_info(self):
         if not self._auth_token:
@@ -72,6 +82,22 @@ class DGGAPI:
             for m in unread
         }
 
+    def messages_read(self):
+        """Marks all private messages as read, without retrieving them."""
+
+        if not self._session_id:
+            raise AnonymousSessionError('unable to mark messages as read')
+
+        self._post('/messages/read', as_json=False)
+
+    def messages_open(self, message_id):
+        """Marks a single private message as read, without retrieving it."""
+
+        if not self._session_id:
+            raise AnonymousSessionError('unable to mark message as read')
+
+        self._post(f"/messages/msg/{message_id}/open", as_json=False)
+
     def _get_inbox(self, user, offset=0, received_only=True):
         inbox = self._get(f"/messages/usr/{user}/inbox?s={offset}")
 
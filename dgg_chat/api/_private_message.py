@@ -1,11 +1,24 @@
-from json import dumps
-from datetime import datetime
+import orjson
 
 from ..messages import Message
-from .._utils import dict_swap_keys
+from .._utils import dict_swap_keys, parse_api_datetime
 from .._event_types import EventTypes
 
 
+# api response keys renamed to their `PrivateMessage` counterparts
+_API_KEY_MAP = {
+    'deletedbyreceiver': 'deleted_by_receiver',
+    'deletedbysender': 'deleted_by_sender',
+    'from': 'from_user',
+    'to': 'target_user',
+    'userid': 'from_user_id',
+    'targetuserid': 'target_user_id',
+    'isread': 'is_read',
+    'message': 'content',
+    'timestamp': 'date_time',
+}
+
+
 class PrivateMessage:
     def __init__(
         self, id,
@@ -22,25 +35,13 @@ class PrivateMessage:
         self.target_user = target_user
         self.from_user_id = from_user_id
         self.target_user_id = target_user_id
-        self.date_time = datetime.strptime(date_time, '%Y-%m-%dT%H:%M:%S+0000')
+        self.date_time = parse_api_datetime(date_time)
         self.is_read = bool(int(is_read))
         self.content = content
 
     @classmethod
     def from_api_response(cls, response):
-        key_map = {
-            'deletedbyreceiver': 'deleted_by_receiver',
-            'deletedbysender': 'deleted_by_sender',
-            'from': 'from_user',
-            'to': 'target_user',
-            'userid': 'from_user_id',
-            'targetuserid': 'target_user_id',
-            'isread': 'is_read',
-            'message': 'content',
-            'timestamp': 'date_time',
-        }
-        response = dict_swap_keys(response, key_map)
-        return cls(**response)
+        return cls(**dict_swap_keys(response, _API_KEY_MAP))
 
     @property
     def as_websocket_message(self):
@@ -50,5 +51,5 @@ class PrivateMessage:
             'timestamp': int(1000*self.date_time.timestamp()),
             'data': self.content,
         }
-        msg = f"{EventTypes.WHISPER} {dumps(payload, ensure_ascii=False)}"
+        msg = f"{EventTypes.WHISPER} {orjson.dumps(payload).decode()}"
         return Message.parse(msg)
@@ -1,4 +1,10 @@
 class StreamInfo:
+    __slots__ = (
+        'started_at', 'ended_at', 'duration',
+        'viewers', 'game', 'host', 'live',
+        'preview', 'status_text',
+    )
+
     def __init__(
         self,
         started_at, ended_at, duration,
@@ -1,9 +1,19 @@
-from datetime import datetime
+from .._utils import camel_to_snake_case, parse_api_datetime
 
-from .._utils import dict_keys_camel_to_snake_case
+
+# snake cased api response keys that don't match their `User` counterparts
+_API_KEY_MAP = {
+    'user_id': 'id',
+    'user_status': 'status',
+}
 
 
 class User:
+    __slots__ = (
+        'id', 'nick', 'username', 'status', 'auth_provider', 'country',
+        'created_date', 'features', 'roles', 'settings', 'subscription',
+    )
+
     def __init__(
         self, id=None, nick=None, username=None,
         status=None, auth_provider=None, country=None,
@@ -16,9 +26,7 @@ class User:
         self.status = status
         self.auth_provider = auth_provider
         self.country = country  # currently not supported
-        self.created_date = datetime.strptime(
-            created_date, '%Y-%m-%dT%H:%M:%S+0000'
-        ) if created_date else None
+        self.created_date = parse_api_datetime(created_date) if created_date else None
         self.features = features
         self.roles = roles
         self.settings = settings
@@ -29,12 +37,11 @@ class User:
 
     @classmethod
     def from_api_response(cls, response):
-        response = dict_keys_camel_to_snake_case(response)
-        if 'user_id' in response:
-            response['id'] = response.pop('user_id')
-        if 'user_status' in response:
-            response['status'] = response.pop('user_status')
-        return cls(**response)
+        # keys are snake cased and renamed in a single pass
+        return cls(**{
+            _API_KEY_MAP.get(snaked := camel_to_snake_case(key), snaked): value
+            for key, value in response.items()
+        })
 
     @property
     def is_subbed(self):
@@ -1,8 +1,9 @@
 import logging
 from re import findall
-from json import loads
 from requests import get
 
+import orjson
+
 from ..exceptions import APIError, CDNError
 
 
@@ -27,7 +28,7 @@ class DGGCDN:
         r = get(self.DGG)
 
         if r.status_code != 200:
-            raise APIError(DGG, r)
+            raise APIError(self.DGG, r)
 
         content = r.content.decode('utf8')
         match = findall(self.PATTERN, content)
@@ -37,17 +38,19 @@ class DGGCDN:
 
         self.cache_key, self.cdn = match[0]
 
-        logging.info(f"setup cdn: {self.cdn} cache key: {self.cache_key}")
+        logging.info('setup cdn: %s cache key: %s', self.cdn, self.cache_key)
 
     def get(self, object_path, as_json=True):
         if not object_path.startswith('/'):
             object_path = f"/{object_path}"
 
         url = f"{self.cdn}{object_path}?_={self.cache_key}"
-        logging.info(f"retrieving: {url}")
+        logging.info('retrieving: %s', url)
         r = get(url, allow_redirects=False)
 
-        logging.info(f"retrieved: {r.content.decode('utf8')[:200]}")
+        # avoid decoding responses that won't be logged
+        if logging.root.isEnabledFor(logging.INFO):
+            logging.info('retrieved: %s', r.content.decode('utf8')[:200])
 
         if r.status_code in (301, 404):
             raise FileNotFoundError(object_path)
@@ -56,7 +59,7 @@ class DGGCDN:
             raise APIError(url, r)
 
         if as_json:
-            return loads(r.content.decode('utf8'))
+            return orjson.loads(r.content)
 
         return r.content
 
@@ -1,29 +1,22 @@
-import logging
-
-
 class APIError(Exception):
     def __init__(self, endpoint, response):
-        message = f"failed to call `{endpoint}`: {response.status_code} `{response.content.decode('utf8')}`"
-        logging.warning(message)
-        super().__init__(message)
+        self.endpoint = endpoint
+        self.response = response
+        super().__init__(endpoint, response.status_code)
+
+    def __str__(self):
+        # the response body is only decoded if the error is displayed
+        return f"failed to call `{self.endpoint}`: {self.response.status_code} `{self.response.content.decode('utf8')}`"
 
 
 class AnonymousConnectionError(Exception):
     def __init__(self, message='connection is anonymous'):
-        message = f"{message}: no auth token provided"
-
-        logging.warning(message)
-
-        super().__init__(message)
+        super().__init__(f"{message}: no auth token provided")
 
 
 class AnonymousSessionError(Exception):
     def __init__(self, message='session is anonymous'):
-        message = f"{message}: no session id provided"
-
-        logging.warning(message)
-
-        super().__init__(message)
+        super().__init__(f"{message}: no session id provided")
 
 
 class CDNError(Exception):
@@ -57,8 +50,4 @@ class InvalidChatLine(Exception):
 
 class InvalidMessageError(Exception):
     def __init__(self, message):
-        message = f"message length should be between 1 and 512 characters: `{message}`"
-
-        logging.warning(message)
-
-        super().__init__(message)
+        super().__init__(f"message length should be between 1 and 512 characters: `{message}`")
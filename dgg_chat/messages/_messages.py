@@ -1,125 +1,192 @@
-from json import loads, dumps
+from sys import intern
+from json import dumps
+from functools import lru_cache
+
+import orjson
 
 from .._event_types import EventTypes
 
 
+# first characters of the payloads that are decoded
+_JSON_STARTS = frozenset('{["')
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls):
+    """The names of the fields shown for `cls`: all slots from it and its bases, base ones first."""
+    names = tuple(
+        name
+        for base in reversed(cls.__mro__)
+        for name in base.__dict__.get('__slots__', ())
+    )
+    # subclasses already expose what's in the payload as attributes
+    if issubclass(cls, Message) and cls is not Message:
+        names = tuple(name for name in names if name != 'payload')
+    return names
+
+
+def _fields_as_dict(obj):
+    return {name: getattr(obj, name, None) for name in _field_names(type(obj))}
+
+
 class ChatUser:
+    # created for every message received, so no `__dict__` for these
+    __slots__ = ('nick', 'features')
+
     def __init__(self, nick, features):
         self.nick = nick
         self.features = features
 
     @classmethod
     def from_ws_messsage(cls, msg):
-        return cls(nick=msg.get('nick'), features=msg.get('features'))
+        # whispers rebuilt from the api (see `PrivateMessage`) have no features
+        return cls(msg['nick'], msg.get('features'))
 
     def __repr__(self):
         return f"ChatUser(nick='{self.nick}')"
 
 
 class Message:
+    __slots__ = ('event', 'payload')
+
     def __init__(self, msg):
-        split = msg.split()
-        self.event = split[0]
-        payload = ' '.join(split[1:])
+        event, _, payload = msg.partition(' ')
+        # interned so lookups and comparisons against `EventTypes` match by identity
+        self.event = intern(event)
+        # dgg payloads are either json objects or strings (e.g. error messages),
+        # anything else (including no payload) is kept as is without trying to decode it
+        if payload[:1] not in _JSON_STARTS:
+            self.payload = payload
+            return
         try:
-            self.payload = loads(payload)
-        except:
+            self.payload = orjson.loads(payload)
+        except orjson.JSONDecodeError:
             self.payload = payload
 
     def __repr__(self):
-        obj = self.__dict__.copy()
-        if type(self).__name__ != Message.__name__:
-            del obj['payload']
-        return dumps(obj, default=lambda o: o.__dict__, ensure_ascii=False)
+        # called for every message logged, so it's encoded with orjson. `json` is for pretty printing
+        return orjson.dumps(_fields_as_dict(self), default=_fields_as_dict).decode()
+
+    @staticmethod
+    def peek_event(msg):
+        """Returns the event type of a raw message without parsing its payload."""
+        return msg.partition(' ')[0]
 
     @classmethod
-    def parse(cls, msg):
-        event = msg.split()[0]
-        if event == EventTypes.SERVED_CONNECTIONS:
-            return ServedConnections(msg)
-        if event == EventTypes.USER_JOINED:
-            return UserJoined(msg)
-        if event == EventTypes.USER_QUIT:
-            return UserQuit(msg)
-        if event == EventTypes.BROADCAST:
-            return Broadcast(msg)
-        if event == EventTypes.CHAT_MESSAGE:
-            return ChatMessage(msg)
-        if event == EventTypes.WHISPER:
-            return Whisper(msg)
-        if EventTypes.is_moderation_event(event):
-            return ModerationMessage(msg)
-        return cls(msg)
+    def parse(cls, msg, event=None):
+        """
+        Parses `msg` into the `Message` subclass for its event type.
+        `event` can be passed if already known (e.g. from `peek_event()`), so it isn't looked up again.
+        """
+
+        if event is None:
+            event = cls.peek_event(msg)
+        return _MESSAGE_CLASSES.get(event, cls)(msg)
 
     @property
     def json(self):
-        obj = self.__dict__.copy()
-        if type(self).__name__ != Message.__name__:
-            del obj['payload']
-        return dumps(obj, default=lambda o: o.__dict__, indent=4, ensure_ascii=False)
+        return dumps(_fields_as_dict(self), default=_fields_as_dict, indent=4, ensure_ascii=False)
 
 
 class ServedConnections(Message):
+    __slots__ = ('count', 'users')
+
     def __init__(self, msg):
         super().__init__(msg)
-        self.count = self.payload.get('connectioncount')
-        self.users = [
-            ChatUser.from_ws_messsage(u) for u in self.payload.get('users')
-        ]
+        payload = self.payload
+        self.count = payload.get('connectioncount')
+        # can be thousands of users, so they're created directly instead of through `from_ws_messsage()`
+        chat_user = ChatUser
+        self.users = [chat_user(u['nick'], u.get('features')) for u in payload['users']]
 
 
 class UserJoined(Message):
+    __slots__ = ('user', 'timestamp')
+
     def __init__(self, msg):
         super().__init__(msg)
-        self.user = ChatUser.from_ws_messsage(self.payload)
-        self.timestamp = self.payload.get('timestamp')/1000.
+        payload = self.payload
+        self.user = ChatUser.from_ws_messsage(payload)
+        self.timestamp = payload['timestamp']/1000.
 
 
 class UserQuit(Message):
+    __slots__ = ('user', 'timestamp')
+
     def __init__(self, msg):
         super().__init__(msg)
-        self.user = ChatUser.from_ws_messsage(self.payload)
-        self.timestamp = self.payload.get('timestamp')/1000.
+        payload = self.payload
+        self.user = ChatUser.from_ws_messsage(payload)
+        self.timestamp = payload['timestamp']/1000.
 
 
 class Broadcast(Message):
+    __slots__ = ('timestamp', 'content')
+
     def __init__(self, msg):
         super().__init__(msg)
-        self.timestamp = self.payload.get('timestamp')/1000.
-        self.content = self.payload.get('data')
+        payload = self.payload
+        self.timestamp = payload['timestamp']/1000.
+        self.content = payload.get('data')
 
 
 class ChatMessage(Message):
+    __slots__ = ('user', 'timestamp', 'content')
+
     def __init__(self, msg):
         super().__init__(msg)
-        self.user = ChatUser.from_ws_messsage(self.payload)
-        self.timestamp = self.payload.get('timestamp')/1000.
-        self.content = self.payload.get('data')
+        payload = self.payload
+        self.user = ChatUser.from_ws_messsage(payload)
+        self.timestamp = payload['timestamp']/1000.
+        self.content = payload.get('data')
 
 
 class Whisper(Message):
+    __slots__ = ('user', 'message_id', 'timestamp', 'content')
+
     def __init__(self, msg):
         super().__init__(msg)
-        self.user = ChatUser.from_ws_messsage(self.payload)
-        self.message_id = self.payload.get('messageid')
-        self.timestamp = self.payload.get('timestamp')/1000.
-        self.content = self.payload.get('data')
+        payload = self.payload
+        self.user = ChatUser.from_ws_messsage(payload)
+        self.message_id = payload.get('messageid')
+        self.timestamp = payload['timestamp']/1000.
+        self.content = payload.get('data')
 
 
 class ModerationMessage(Message):
+    __slots__ = ('moderator', 'timestamp', 'affected_user', 'sentence')
+
     def __init__(self, msg):
         super().__init__(msg)
-        self.moderator = ChatUser.from_ws_messsage(self.payload)
-        self.timestamp = self.payload.get('timestamp')/1000.
-        user, *sentence = self.payload.get('data').split()
-        self.affected_user = user
-        self.sentence = ' '.join(sentence)
+        payload = self.payload
+        self.moderator = ChatUser.from_ws_messsage(payload)
+        self.timestamp = payload['timestamp']/1000.
+        self.affected_user, _, self.sentence = payload['data'].partition(' ')
 
 
 class SubOnly(Message):
+    __slots__ = ('moderator', 'timestamp', 'mode')
+
     def __init__(self, msg):
         super().__init__(msg)
-        self.moderator = ChatUser.from_ws_messsage(self.payload)
-        self.timestamp = self.payload.get('timestamp')/1000.
+        payload = self.payload
+        self.moderator = ChatUser.from_ws_messsage(payload)
+        self.timestamp = payload['timestamp']/1000.
         # on or off
-        self.mode = self.payload.get('data')
+        self.mode = payload.get('data')
+
+
+# which `Message` subclass each event is parsed into
+_MESSAGE_CLASSES = {
+    EventTypes.SERVED_CONNECTIONS: ServedConnections,
+    EventTypes.USER_JOINED: UserJoined,
+    EventTypes.USER_QUIT: UserQuit,
+    EventTypes.BROADCAST: Broadcast,
+    EventTypes.CHAT_MESSAGE: ChatMessage,
+    EventTypes.WHISPER: Whisper,
+    EventTypes.MUTE: ModerationMessage,
+    EventTypes.UNMUTE: ModerationMessage,
+    EventTypes.BAN: ModerationMessage,
+    EventTypes.UNBAN: ModerationMessage,
+    EventTypes.SUB_ONLY: SubOnly,
+}
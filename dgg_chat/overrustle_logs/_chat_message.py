@@ -1,11 +1,14 @@
-from re import findall
+from re import compile
 from datetime import datetime
+from functools import lru_cache
 
 from ..exceptions import InvalidChatLine
-from .._utils import format_datetime
 
 
 class ChatMessage:
+    # created for every log line, so no `__dict__` for these
+    __slots__ = ('user', 'date_time', 'content')
+
     CHAT_LINE_PATTERN = r'^\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) UTC\] (\w+): (.+)$'
 
     def __init__(self, user, date_time: datetime, content):
@@ -14,25 +17,76 @@ class ChatMessage:
         self.content = content
 
     def __repr__(self):
-        return f"ChatMessage(user='{self.user}', date_time='{format_datetime(self.date_time)}', content='{self.content}')"
+        return f"ChatMessage(user='{self.user}', date_time='{self._formatted_date_time}', content='{self.content}')"
+
+    @property
+    def _formatted_date_time(self):
+        # same as `strftime('%Y-%m-%d %H:%M:%S')`, but faster
+        return self.date_time.isoformat(' ', 'seconds')
 
     @property
     def original(self):
-        return f"[{format_datetime(self.date_time)}] {self.user}: {self.content}"
+        return f"[{self._formatted_date_time}] {self.user}: {self.content}"
 
     @classmethod
     def from_chat_line(cls, line):
-        match = findall(cls.CHAT_LINE_PATTERN, line.strip())
-        if not match:
-            raise InvalidChatLine(line)
+        stripped = line.strip()
+        parts = _split_chat_line(stripped)
+        if parts is None:
+            match = _CHAT_LINE_PATTERN.match(stripped)
+            if not match:
+                raise InvalidChatLine(line)
+            parts = match.groups()
 
-        date_time, user, content = match[0]
-        return cls(
-            user,
-            datetime.strptime(date_time, '%Y-%m-%d %H:%M:%S'),
-            content,
-        )
+        date_time, user, content = parts
+        try:
+            return cls(user, _parse_date_time(date_time), content)
+        except ValueError:
+            # out of range fields, such as month 13
+            raise InvalidChatLine(line)
 
     @property
     def is_from_anonymous_user(self):
         return self.user == '_anon$'
+
+
+# compiled once, since every log line is matched against it
+_CHAT_LINE_PATTERN = compile(ChatMessage.CHAT_LINE_PATTERN)
+
+
+def _split_chat_line(line):
+    """
+    Splits a log line into its date time, user, and content by slicing, since the format
+    is fixed up to the user. Returns `None` if the line doesn't fit, so the pattern is used instead.
+    """
+
+    if line[:1] != '[' or line[20:26] != ' UTC] ':
+        return None
+
+    # same as `\d{4}-\d\d-\d\d \d\d:\d\d:\d\d`
+    if (
+        line[5] != '-' or line[8] != '-' or line[11] != ' ' or line[14] != ':' or line[17] != ':'
+        or not (line[1:5] + line[6:8] + line[9:11] + line[12:14] + line[15:17] + line[18:20]).isdecimal()
+    ):
+        return None
+
+    colon = line.find(': ', 26)
+    if colon < 0 or colon + 2 == len(line):
+        return None
+
+    user = line[26:colon]
+    if not user.replace('_', '').isalnum():
+        return None
+
+    return line[1:20], user, line[colon + 2:]
+
+
+# a daily log has at most 86400 distinct timestamps, and chat activity clusters them further
+@lru_cache(maxsize=131072)
+def _parse_date_time(date_time):
+    """Parses a `%Y-%m-%d %H:%M:%S` log timestamp by slicing, without going through `strptime()`."""
+
+    return datetime(
+        int(date_time[0:4]), int(date_time[5:7]), int(date_time[8:10]),
+        int(date_time[11:13]), int(date_time[14:16]), int(date_time[17:19]),
+    )
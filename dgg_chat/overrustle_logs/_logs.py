@@ -1,12 +1,22 @@
 import logging
 from typing import Union
-from requests import get
+from requests import Session
+from requests.adapters import HTTPAdapter
 from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from ._chat_message import ChatMessage
 
 from ..exceptions import APIError
-from .._utils import validate_date_time, isplit
+from .._utils import validate_date_time
+
+
+# month names as used in the logs urls, independent of locale
+_MONTH_NAMES = (
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December',
+)
 
 
 class DGGLogs:
@@ -17,37 +27,43 @@ class DGGLogs:
     """
 
     DGG_LOGS = 'https://overrustlelogs.net/Destinygg%20chatlog'
+    # logs are streamed in chunks of this size, instead of being downloaded all at once
+    CHUNK_SIZE = 64*1024  # in bytes
+
+    # reuses connections between requests. responses are gzipped by default
+    _session = Session()
 
     @classmethod
-    def _parse_logs(cls, logs):
-        for line in isplit(logs, '\n'):
+    def _parse_logs(cls, lines):
+        for line in lines:
             if line:
-                yield ChatMessage.from_chat_line(line)
+                yield ChatMessage.from_chat_line(line.decode('utf8'))
 
     @classmethod
     def _build_date(cls, year=0, month=None):
-        if not month:
-            month = datetime.utcnow().month
-        if not year:
-            year = datetime.utcnow().year
+        if not year or not month:
+            now = datetime.utcnow()
+            year = year or now.year
+            month = month or now.month
 
-        if isinstance(month_full := month, int):
-            month_full = datetime.strptime(str(month), '%m').strftime('%B')
+        if isinstance(month, str):
+            # raises `ValueError`
+            month = _MONTH_NAMES.index(month.capitalize()) + 1
 
         # raises `ValueError`
         validate_date_time(year=year, month=month)
-        return f"{month_full} {year}"
+        return f"{_MONTH_NAMES[month - 1]} {year}"
 
     @classmethod
-    def _get(cls, endpoint, year=0, month=None):
+    def _request(cls, endpoint, year=0, month=None, stream=True, session=None):
         date = cls._build_date(year, month)
         url = f"{cls.DGG_LOGS}/{date}/{endpoint}"
 
-        logging.info(f"retrieving: {url}")
+        logging.info('retrieving: %s', url)
 
-        r = get(url)
+        r = (session or cls._session).get(url, stream=stream)
 
-        logging.info(f"response: {r.status_code}")
+        logging.info('response: %s', r.status_code)
 
         if r.status_code == 404:
             raise FileNotFoundError
@@ -55,7 +71,49 @@ class DGGLogs:
         if r.status_code != 200:
             raise APIError(url, r)
 
-        return cls._parse_logs(r.content.decode('utf8'))
+        return r
+
+    @classmethod
+    def _get(cls, endpoint, year=0, month=None):
+        r = cls._request(endpoint, year, month)
+        return cls._parse_logs(r.iter_lines(cls.CHUNK_SIZE))
+
+    @classmethod
+    def _get_months(cls, endpoint, months, max_workers):
+        with Session() as session, ThreadPoolExecutor(max_workers) as executor:
+            # a connection for each worker, instead of sharing the default pool
+            session.mount('https://', HTTPAdapter(pool_maxsize=max_workers))
+
+            # whole responses are downloaded, so they don't wait on the previous months to be parsed.
+            # only up to `max_workers` months are retrieved ahead of the one being parsed
+            months = iter(months)
+            responses = deque()
+
+            def submit_next():
+                for year, month in months:
+                    responses.append(
+                        executor.submit(cls._request, endpoint, year, month, stream=False, session=session)
+                    )
+                    return
+
+            for _ in range(max_workers):
+                submit_next()
+
+            try:
+                while responses:
+                    response = responses.popleft()
+                    submit_next()
+                    try:
+                        lines = response.result().content.splitlines()
+                    except FileNotFoundError:
+                        continue
+                    # not kept around while its lines are parsed
+                    del response
+                    yield from cls._parse_logs(lines)
+            finally:
+                # if iteration stops early, months not being downloaded yet are skipped
+                for response in responses:
+                    response.cancel()
 
     @classmethod
     def get_daily_logs(cls, year=0, month=0, day=0):
@@ -90,6 +148,38 @@ class DGGLogs:
         endpoint = f"userlogs/{user}.txt"
         return cls._get(endpoint, year, month)
 
+    @classmethod
+    def get_user_logs_range(cls, user, start, end=None, max_workers=8):
+        """
+        Retrieves user logs for every month from `start` to `end` (inclusive), in order.
+        Months are downloaded concurrently, up to `max_workers` at a time.
+        Months without logs for the user are skipped.
+
+        `start` : `tuple`
+
+            `(year, month)` of the first month, with `month` as an `int`.
+
+        `end` : `tuple`
+
+            `(year, month)` of the last month. If not provided, use current based on UTC time.
+
+        """
+
+        if not end:
+            now = datetime.utcnow()
+            end = (now.year, now.month)
+
+        # raises `ValueError`, before anything is retrieved
+        validate_date_time(*start)
+        validate_date_time(*end)
+
+        (year, month), months = start, []
+        while (year, month) <= tuple(end):
+            months.append((year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+        return cls._get_months(f"userlogs/{user}.txt", months, max_workers)
+
     @classmethod
     def get_broadcaster_logs(cls, year=0, month: Union[int, str] = None):
         """
@@ -27,6 +27,10 @@ setup(
     install_requires=[
         'websocket_client',
         'requests',
+        'orjson',  # faster json encoding/decoding
         'numpy', 'wsaccel'  # improve websockets performance
     ],
+    extras_require={
+        'speedups': ['ciso8601'],  # faster datetime parsing
+    },
 )